@@ -1,9 +1,29 @@
 import requests
-from bs4 import BeautifulSoup
-import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment
+from requests.adapters import HTTPAdapter
+from lxml import html
+from lxml.cssselect import CSSSelector
+from lxml.etree import ParserError, XPath
+import bisect
+import gzip
+import hashlib
 import os
 import re
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+
+# Prefer the Rust-backed, openpyxl-compatible writer when it is installed
+try:
+    from wolfxl import Workbook, load_workbook
+    from wolfxl.cell import WriteOnlyCell
+    from wolfxl.styles import Font, PatternFill, Alignment, NamedStyle
+except ImportError:
+    from openpyxl import Workbook, load_workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill, Alignment, NamedStyle
 
 # Constants for colors
 ARTICLE_CONV = {
@@ -13,14 +33,26 @@ ARTICLE_CONV = {
     "": "",
 }
 
+# Colors are full ARGB so the fills are opaque (6-digit values get alpha 00)
 ARTICLE_COLORS = {
-    "der": "0000FF",  # Blue
-    "die": "FF0000",  # Red
-    "das": "008000",  # Green
-    "": "8B4513",     # Brown for no article
-    "verb": "800080"  # Purple for verbs
+    "der": "FF0000FF",  # Blue
+    "die": "FFFF0000",  # Red
+    "das": "FF008000",  # Green
+    "": "FF8B4513",     # Brown for no article
+    "verb": "FF800080"  # Purple for verbs
 }
 
+# Styles are built once and shared by every cell instead of per cell
+HEADER_FONT = Font(bold=True, size=16)
+VERBS_HEADER_FONT = Font(bold=True, size=14)
+HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="center")
+WORD_FONT = Font(color="FFFFFFFF", bold=True)
+WORD_FILLS = {
+    article: PatternFill(start_color=color, end_color=color, fill_type="solid")
+    for article, color in ARTICLE_COLORS.items()
+}
+WORD_STYLE_NAMES = {article: f"art_{article or 'none'}" for article in ARTICLE_COLORS}
+
 TERMINAL_COLORS = {
     "der": "\033[1;34m",  # Blue
     "die": "\033[1;31m",  # Red
@@ -33,30 +65,123 @@ MAGENTA = "\033[1;35m"
 RESET = "\033[0m"
 
 EXCEL_FILE = "German Words.xlsx"
+DB_FILE = "German Words.sqlite"  # Source of truth; the Excel file is generated from it
+LESSON_SHEET_PREFIX = "A1.1 - L"
+PERSONS = ["ich", "du", "er/sie/es", "wir", "ihr", "sie/Sie"]
+WORD_HEADERS = ["Word", "Definition"]
+VERBS_HEADERS = ["Verb", "Definition", *PERSONS]
+CACHE_DIR = ".pons_cache"  # Gzipped copies of downloaded PONS pages, named by URL hash
+CACHE_TTL = 30 * 24 * 60 * 60  # Download pages again after 30 days
+WORD_URL = "https://en.pons.com/translate/german-english/{}"
+VERB_URL = "https://en.pons.com/verb-tables/german/{}"
+SAVE_EVERY = 20  # Save after this many new words in case the session crashes
+
+# Selectors for the PONS pages, compiled to XPath once instead of on every lookup
+WORDCLASS_SELECTOR = CSSSelector("span.wordclass")
+GENUS_SELECTOR = XPath('following-sibling::span[contains(concat(" ", normalize-space(@class), " "), " genus ")][1]')
+SEEALSO_SELECTOR = CSSSelector("div.seealso")
+TRANSLATIONS_SELECTOR = CSSSelector("div.translations")
+TARGET_SELECTOR = CSSSelector("div.target")
+INFO_SELECTOR = CSSSelector("span.info")
+CONJUGATION_TABLE_SELECTOR = CSSSelector("table.table")
+CONJUGATION_CELLS_SELECTOR = XPath(".//tr[count(td) = 2]/td")  # Person and form cell of each row
+
+# Conjugation keys by the text found in the person cell, checked in this order
+PERSON_KEYS = {"ich": "ich", "du": "du", "er/sie/es": "er/sie/es", "wir": "wir", "ihr": "ihr", "sie": "sie/Sie"}
+
+# One session for all PONS requests so connections are kept alive and reused
+SESSION = requests.Session()
+SESSION.headers.update({"Accept-Encoding": "gzip, deflate", "User-Agent": "vocab/1.0"})
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+# Pages are downloaded in the background while the user is choosing a definition
+PENDING_PAGES = {}
+
+def download_page(url):
+    """Downloads a page from PONS, reusing a cached copy if it was downloaded before.
+
+    Returns the status code and the page content; the status code is None on network errors."""
+    cache_path = os.path.join(CACHE_DIR, hashlib.sha1(url.encode()).hexdigest() + ".html.gz")
+    try:
+        if time.time() - os.path.getmtime(cache_path) < CACHE_TTL:
+            with open(cache_path, "rb") as f:
+                return 200, gzip.decompress(f.read())
+    except OSError:
+        pass  # Not cached yet
+
+    try:
+        response = SESSION.get(url, timeout=10)
+    except requests.RequestException:
+        return None, b""
+    if response.status_code == 200:  # Only cache successful lookups
+        tmp_path = None
+        try:
+            # Each write gets its own temporary file, so concurrent downloads of the same
+            # page can't clash and a half-written page is never read back
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=CACHE_DIR, delete=False) as f:
+                tmp_path = f.name
+                f.write(gzip.compress(response.content))
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            # The cache is optional; drop the partial file and still return the downloaded page
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+    return response.status_code, response.content
+
+def download_in_background(url, future):
+    """Downloads a page and hands the result to the waiting future."""
+    try:
+        future.set_result(download_page(url))
+    except Exception as e:
+        future.set_exception(e)
+
+def prefetch_pages(*urls):
+    """Starts downloading the given pages concurrently, replacing any earlier unused downloads.
+
+    Downloads run on daemon threads, so quitting never waits for a page that is no longer needed."""
+    PENDING_PAGES.clear()
+    for url in urls:
+        future = PENDING_PAGES[url] = Future()
+        threading.Thread(target=download_in_background, args=(url, future), daemon=True).start()
+
+def fetch_page(url):
+    """Returns the status code and content of a page, waiting for it if it is being prefetched."""
+    future = PENDING_PAGES.pop(url, None)
+    if future is not None:
+        return future.result()
+    return download_page(url)
 
 def get_word_data(word):
     """Fetches the article and definitions of a word from PONS."""
-    url = f"https://en.pons.com/translate/german-english/{word.lower()}"
-    response = requests.get(url)
-    
-    if response.status_code != 200:
-        print("Error: Unable to fetch data from PONS.")
-        return None, None
+    url = WORD_URL.format(word.lower())
+    status_code, content = fetch_page(url)
 
-    soup = BeautifulSoup(response.text, "html.parser")
+    if status_code != 200:
+        print("Error: Unable to fetch data from PONS.")
+        return None, None, False
 
     try:
+        doc = html.fromstring(content)
+
         article = ""  # Initialize article variable
-        wordclass_tags = soup.find_all("span", class_="wordclass")
+        wordclass_tags = WORDCLASS_SELECTOR(doc)
         word_classes = []
         for tag in wordclass_tags:
-            word_class = tag.text.strip()
+            word_class = tag.text_content().strip()
             if word_class.lower() != "phrase":  # Exclude "phrases" class
-                article_tag = tag.find_next_sibling("span", class_="genus")
-                article = article_tag.text.strip() if article_tag else ""            
+                article_tags = GENUS_SELECTOR(tag)
+                article = article_tags[0].text_content().strip() if article_tags else ""
                 word_classes.append((word_class, article))
         word_classes = list(dict.fromkeys(word_classes))  # Remove duplicates
 
+        # Start fetching the conjugations while the user picks a definition
+        if any(wc == "VB" for wc, _ in word_classes):
+            prefetch_pages(VERB_URL.format(word.lower()))
+
         is_verb = False
         if len(word_classes) > 1 and any(wc in ["N", "VB"] for wc, _ in word_classes):
             print("Multiple word classes found:")
@@ -85,19 +210,19 @@ def get_word_data(word):
 
 
         # Exclude "seealso" sections
-        seealso_sections = soup.find_all("div", class_="seealso")
+        seealso_sections = SEEALSO_SELECTOR(doc)
         for section in seealso_sections:
-            section.decompose()  # Remove the seealso section
+            section.drop_tree()  # Remove the seealso section
 
-        definition_tags = soup.find_all("div", class_="translations")
+        definition_tags = TRANSLATIONS_SELECTOR(doc)
         definitions = []
         for tag in definition_tags:
-            target_tags = tag.find_all("div", class_="target", limit=2)
+            target_tags = TARGET_SELECTOR(tag)[:2]
             for target in target_tags:
                 # Remove span elements with the "info" class
-                for span in target.find_all("span", class_="info"):
-                    span.decompose()
-                definition = " ".join(target.stripped_strings)
+                for span in INFO_SELECTOR(target):
+                    span.clear(keep_tail=True)  # Unlike drop_tree(), keeps the following text a separate string
+                definition = " ".join(t.strip() for t in target.itertext() if t.strip())
                 definitions.append(definition)
                 
         definitions = list(dict.fromkeys(definitions))  # Remove duplicates
@@ -134,140 +259,231 @@ def get_word_data(word):
                 print("Invalid input: Please enter a valid number or key.")
 
         return article, selected_definition, is_verb
-    except AttributeError:
+    except ParserError:
         print("Warning: Could not determine the article or definitions.")
         return "", "", False
 
 def get_verb_conjugations(verb):
     """Fetches the conjugations for Indikativ Präsens from PONS."""
-    url = f"https://en.pons.com/verb-tables/german/{verb.lower()}"
-    response = requests.get(url)
-    
-    if response.status_code != 200:
+    url = VERB_URL.format(verb.lower())
+    status_code, content = fetch_page(url)
+
+    if status_code != 200:
         print("Error: Unable to fetch conjugations from PONS.")
         return None
 
-    soup = BeautifulSoup(response.text, "html.parser")
     conjugations = {}
 
     try:
-        table = soup.find("table", class_="table")
-        rows = table.find_all("tr")
-        for row in rows:
-            cols = row.find_all("td")
-            if len(cols) == 2:
-                person = cols[0].text.strip()
-                conjugation = cols[1].text.strip()
-                if "ich" in person:
-                    conjugations["ich"] = conjugation
-                elif "du" in person:
-                    conjugations["du"] = conjugation
-                elif "er/sie/es" in person:
-                    conjugations["er/sie/es"] = conjugation
-                elif "wir" in person:
-                    conjugations["wir"] = conjugation
-                elif "ihr" in person:
-                    conjugations["ihr"] = conjugation
-                elif "sie" in person:
-                    conjugations["sie/Sie"] = conjugation
+        table = CONJUGATION_TABLE_SELECTOR(html.fromstring(content))[0]
+        cells = CONJUGATION_CELLS_SELECTOR(table)
+        for person_cell, conjugation_cell in zip(cells[::2], cells[1::2]):
+            person = person_cell.text_content().strip()
+            key = next((v for k, v in PERSON_KEYS.items() if k in person), None)
+            if key:
+                conjugations[key] = conjugation_cell.text_content().strip()
         return conjugations
-    except AttributeError:
+    except (ParserError, IndexError):
         print("Warning: Could not determine the conjugations.")
         return None
 
 def create_or_load_excel():
-    """Creates a new Excel file if it doesn't exist, otherwise loads it."""
-    if os.path.exists(EXCEL_FILE):
-        wb = openpyxl.load_workbook(EXCEL_FILE)
-    else:
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "General"
-        ws.append(["Word", "Definition"])
-        bold_font = Font(bold=True, size=16)
-        alignment_center = Alignment(horizontal="center", vertical="center")
-        for col in range(1, 3):
-            ws.cell(row=1, column=col).font = bold_font
-            ws.cell(row=1, column=col).alignment = alignment_center
-
-        # Create sheets for each article
-        for article in ["der", "die", "das", "No Article"]:
-            ws = wb.create_sheet(title=article)
-            ws.append(["Word", "Definition"])
-            for col in range(1, 3):
-                ws.cell(row=1, column=col).font = bold_font
-                ws.cell(row=1, column=col).alignment = alignment_center
-
-        wb.save(EXCEL_FILE)
-    return wb
-
-def check_duplicate(word, definition, wb):
-    """Checks if a word already exists in the Excel file."""
-    for sheet in wb.sheetnames:
-        ws = wb[sheet]
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            if row[0].lower() == word.lower() and row[1].lower() == definition.lower():
-                return row[0], row[1]  # Return word and definition
-    return None, None
-
-def create_lesson_sheet(wb, lesson):
+    """Opens the word database, creating it from an existing Excel file the first time, and loads it into memory."""
+    if not os.path.exists(DB_FILE):
+        # Build the database aside so a failed import is retried on the next run
+        # instead of leaving an empty database that would overwrite the Excel file
+        tmp_db_file = DB_FILE + ".tmp"
+        for leftover in (tmp_db_file, tmp_db_file + "-journal"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+        db = sqlite3.connect(tmp_db_file)
+        db.execute("""CREATE TABLE words (
+            full_word TEXT NOT NULL,
+            definition TEXT NOT NULL,
+            article TEXT NOT NULL,
+            lesson INTEGER,  -- NULL for words imported from outside the lesson sheets
+            is_verb INTEGER NOT NULL,
+            ich TEXT, du TEXT, er_sie_es TEXT, wir TEXT, ihr TEXT, sie TEXT,
+            PRIMARY KEY (full_word, definition)
+        )""")
+        if os.path.exists(EXCEL_FILE):
+            # The Excel file is regenerated from the database afterwards, so keep the original
+            shutil.copy2(EXCEL_FILE, EXCEL_FILE + ".bak")
+            import_excel(db)
+        db.commit()
+        db.close()
+        os.replace(tmp_db_file, DB_FILE)
+
+    db = sqlite3.connect(DB_FILE)
+    vocab = {"db": db, "index": {}, "lessons": {}, "sheets": {name: new_word_sheet() for name in ["General", "der", "die", "das", "No Article"]}}
+    for full_word, definition, article, lesson, is_verb, *conjugations in db.execute("SELECT * FROM words ORDER BY rowid"):
+        conjugations = dict(zip(PERSONS, conjugations)) if any(conjugations) else None
+        place_word(vocab, full_word, definition, article, lesson, is_verb, conjugations)
+
+    # Regenerate the Excel file if words were stored after it was last saved, e.g. after a crash
+    if not os.path.exists(EXCEL_FILE) or os.path.getmtime(DB_FILE) > os.path.getmtime(EXCEL_FILE):
+        save_excel(vocab)
+    return vocab
+
+def cell_text(value):
+    """Returns the text of a cell read from an existing Excel file, which may hold numbers or be empty."""
+    return "" if value is None else str(value)
+
+def import_excel(db):
+    """Copies the words of an Excel file written by an earlier version into the database."""
+    # Only values are needed, so use the streaming reader (the sheets hold plain strings)
+    wb = load_workbook(EXCEL_FILE, read_only=True, data_only=True)
+    has_general = "General" in wb.sheetnames
+    general = set()
+    if has_general:
+        for row in wb["General"].iter_rows(min_row=2, max_col=2, values_only=True):
+            general.add((cell_text(row[0]), cell_text(row[1])))
+    verbs = {}
+    if "Verbs" in wb.sheetnames:
+        for row in wb["Verbs"].iter_rows(min_row=2, max_col=2 + len(PERSONS), values_only=True):
+            conjugations = [None if value is None else str(value) for value in row[2:]]
+            verbs[(cell_text(row[0]), cell_text(row[1]))] = (conjugations + [None] * len(PERSONS))[:len(PERSONS)]
+
+    # Every word is in exactly one lesson sheet; verbs are the ones missing from the general sheet
+    imported = set()
+    other_sheets = []
+    for ws in wb.worksheets:
+        try:
+            if not ws.title.startswith(LESSON_SHEET_PREFIX):
+                raise ValueError
+            lesson = int(ws.title[len(LESSON_SHEET_PREFIX):])
+        except ValueError:
+            other_sheets.append(ws)
+            continue
+        for row in ws.iter_rows(min_row=2, max_col=2, values_only=True):
+            key = (cell_text(row[0]), cell_text(row[1]))
+            if key[0]:
+                is_verb = key not in general if has_general else key in verbs
+                import_word(db, *key, lesson, is_verb, verbs.get(key))
+                imported.add(key)
+
+    # Words added to the other sheets by hand aren't in any lesson sheet; keep them without a lesson
+    for ws in other_sheets:
+        for row in ws.iter_rows(min_row=2, max_col=2, values_only=True):
+            key = (cell_text(row[0]), cell_text(row[1]))
+            if key[0] and key not in imported:
+                import_word(db, *key, None, key in verbs and key not in general, verbs.get(key))
+                imported.add(key)
+    wb.close()
+
+def import_word(db, full_word, definition, lesson, is_verb, conjugations):
+    """Stores a word read from an existing Excel file in the database."""
+    checked_article = full_word.split(" ", 1)[0] if " " in full_word else ""
+    real_article = checked_article if checked_article in ("der", "die", "das") else ""
+    db.execute("INSERT OR IGNORE INTO words VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+               (full_word, definition, real_article, lesson, int(is_verb), *(conjugations or [None] * len(PERSONS))))
+
+def check_duplicate(word, definition, vocab):
+    """Checks if a word already exists, using the in-memory index loaded from the database."""
+    return vocab["index"].get((word.casefold(), definition.casefold()), (None, None))
+
+def create_lesson_sheet(vocab, lesson):
     """Creates a new lesson sheet if it doesn't exist."""
-    lesson_sheet_name = f"A1.1 - L{lesson}"
-    if lesson_sheet_name not in wb.sheetnames:
-        lesson_ws = wb.create_sheet(title=lesson_sheet_name)
-        lesson_ws.append(["Word", "Definition"])
-        bold_font = Font(bold=True, size=16)
-        alignment_center = Alignment(horizontal="center", vertical="center")
-        for col in range(1, 3):
-            lesson_ws.cell(row=1, column=col).font = bold_font
-            lesson_ws.cell(row=1, column=col).alignment = alignment_center
-    else:
-        lesson_ws = wb[lesson_sheet_name]
-    return lesson_ws
-
-def create_verbs_sheet(wb):
+    lesson_sheet = vocab["lessons"].get(lesson)
+    if lesson_sheet is None:
+        # Cached by lesson number so known lessons don't rebuild the sheet name
+        lesson_sheet = vocab["sheets"][f"{LESSON_SHEET_PREFIX}{lesson}"] = new_word_sheet()
+        vocab["lessons"][lesson] = lesson_sheet
+    return lesson_sheet
+
+def create_verbs_sheet(vocab):
     """Creates a new verbs sheet if it doesn't exist."""
-    if "Verbs" not in wb.sheetnames:
-        verbs_ws = wb.create_sheet(title="Verbs")
-        verbs_ws.append(["Verb", "Definition", "ich", "du", "er/sie/es", "wir", "ihr", "sie/Sie"])
-        bold_font = Font(bold=True, size=14)
-        alignment_center = Alignment(horizontal="center", vertical="center")
-        for col in range(1, 9):
-            verbs_ws.cell(row=1, column=col).font = bold_font
-            verbs_ws.cell(row=1, column=col).alignment = alignment_center
-    else:
-        verbs_ws = wb["Verbs"]
-    return verbs_ws
-
-def sort_and_color_sheet(ws):
-    """Sorts the sheet alphabetically by the word itself, ignoring the articles, and optionally changes the colors."""
-    data = list(ws.iter_rows(min_row=2, values_only=True))
-    sorted_data = sorted(data, key=lambda x: x[0].split(" ", 1)[1].lower() if " " in x[0] else x[0].lower())
-    for idx, row in enumerate(sorted_data, start=2):
-        for col, value in enumerate(row, start=1):
-            ws.cell(row=idx, column=col, value=value)
-            if col == 1:  # Apply color to the word cell
-                checked_article = value.split(" ", 1)[0] if " " in value else ""
-                color = ARTICLE_COLORS.get(checked_article, ARTICLE_COLORS[""])
-                ws.cell(row=idx, column=col).fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
-                ws.cell(row=idx, column=col).font = Font(color="FFFFFF", bold=True)
-
-def add_word_to_sheet(ws, full_word, definition):
-    """Adds a word to a specific sheet and sorts it."""
-    ws.append([full_word, definition])
-    sort_and_color_sheet(ws)
-
-def add_verb_to_sheet(ws, verb, definition, conjugations):
+    return vocab["sheets"].setdefault("Verbs", [])
+
+def sort_key(full_word):
+    """Returns the key used to sort words alphabetically, ignoring the articles."""
+    return full_word.split(" ", 1)[-1].casefold()
+
+def new_word_sheet():
+    """Returns an empty word sheet.
+
+    Columns are kept in parallel lists so sorting only has to touch the precomputed sort keys."""
+    return {"words": [], "sort_keys": [], "definitions": [], "articles": []}
+
+def add_word_to_sheet(sheet, full_word, definition):
+    """Inserts a word into a specific sheet, keeping it sorted."""
+    key = sort_key(full_word)
+    idx = bisect.bisect_right(sheet["sort_keys"], key)
+    sheet["words"].insert(idx, full_word)
+    sheet["sort_keys"].insert(idx, key)
+    sheet["definitions"].insert(idx, definition)
+    sheet["articles"].insert(idx, full_word.split(" ", 1)[0] if " " in full_word else "")
+
+def add_verb_to_sheet(rows, verb, definition, conjugations):
     """Adds a verb to the verbs sheet with its conjugations."""
-    ws.append([verb, definition, conjugations.get("ich"), conjugations.get("du"), conjugations.get("er/sie/es"), conjugations.get("wir"), conjugations.get("ihr"), conjugations.get("sie/Sie")])
-    for idx, row in enumerate(ws.iter_rows(min_row=2, max_row=ws.max_row, values_only=True), start=2):
-        for col, value in enumerate(row, start=1):
-            if col == 1:  # Apply purple color to the verb cell
-                ws.cell(row=idx, column=col).fill = PatternFill(start_color=ARTICLE_COLORS["verb"], end_color=ARTICLE_COLORS["verb"], fill_type="solid")
-                ws.cell(row=idx, column=col).font = Font(color="FFFFFF", bold=True)
-
-def add_word_to_excel(word, article, definition, lesson, wb):
-    """Adds a word to the general sheet, the relevant article sheet, and the relevant lesson sheet in the Excel file."""  
+    rows.append((verb, definition, *(conjugations.get(person) for person in PERSONS)))
+
+def place_word(vocab, full_word, definition, real_article, lesson, is_verb, conjugations):
+    """Adds a word to the duplicate index and to every sheet it belongs on."""
+    vocab["index"][(full_word.casefold(), definition.casefold())] = (full_word, definition)
+
+    # Add the word to the general and relevant article sheet if it's not a verb
+    if not is_verb:
+        add_word_to_sheet(vocab["sheets"]["General"], full_word, definition)
+        add_word_to_sheet(vocab["sheets"][real_article or "No Article"], full_word, definition)
+
+    # Add the word to the relevant lesson sheet
+    if lesson is not None:
+        add_word_to_sheet(create_lesson_sheet(vocab, lesson), full_word, definition)
+
+    # If the word is a verb, add it to the verbs sheet with conjugations
+    if is_verb and conjugations:
+        add_verb_to_sheet(create_verbs_sheet(vocab), full_word, definition, conjugations)
+
+def header_cells(ws, headers, font):
+    """Returns the styled header row of a sheet."""
+    cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = font
+        cell.alignment = HEADER_ALIGNMENT
+        cells.append(cell)
+    return cells
+
+def add_word_styles(wb):
+    """Registers a named style per article color, so word cells only reference a shared style."""
+    for article, name in WORD_STYLE_NAMES.items():
+        style = NamedStyle(name=name)
+        style.font = WORD_FONT
+        style.fill = WORD_FILLS[article]
+        wb.add_named_style(style)
+
+def word_cell(ws, word, article):
+    """Returns a word cell colored by its article."""
+    cell = WriteOnlyCell(ws, value=word)
+    cell.style = WORD_STYLE_NAMES.get(article, WORD_STYLE_NAMES[""])
+    return cell
+
+def save_excel(vocab):
+    """Writes every sheet to the Excel file, streaming the rows through a write-only workbook."""
+    wb = Workbook(write_only=True)
+    add_word_styles(wb)
+    for name, sheet in vocab["sheets"].items():
+        ws = wb.create_sheet(title=name)
+        if name == "Verbs":
+            ws.append(header_cells(ws, VERBS_HEADERS, VERBS_HEADER_FONT))
+            for verb, *values in sheet:
+                ws.append([word_cell(ws, verb, "verb"), *values])  # Apply purple color to the verb cell
+        else:
+            ws.append(header_cells(ws, WORD_HEADERS, HEADER_FONT))
+            for full_word, definition, checked_article in zip(sheet["words"], sheet["definitions"], sheet["articles"]):
+                ws.append([word_cell(ws, full_word, checked_article), definition])
+
+    # Write aside and swap it in, so the previous file survives an interrupted save
+    tmp_file = EXCEL_FILE + ".tmp"
+    wb.save(tmp_file)
+    os.replace(tmp_file, EXCEL_FILE)
+
+def add_word_to_excel(word, article, definition, lesson, is_verb, vocab):
+    """Adds a word to the general sheet, the relevant article sheet, and the relevant lesson sheet in the Excel file.
+
+    The word is stored in the database right away; the caller is responsible for saving the Excel file.
+    Returns True if the word was added, False if it already existed."""
     
     # Combine the article and word
     real_article = ARTICLE_CONV.get(article)
@@ -284,52 +500,50 @@ def add_word_to_excel(word, article, definition, lesson, wb):
     terminal_color = TERMINAL_COLORS.get(real_article, RESET)
 
     # Check for duplicates in the general sheet
-    existing_word, existing_definition = check_duplicate(full_word, definition, wb)
+    existing_word, existing_definition = check_duplicate(full_word, definition, vocab)
     if existing_word:        
         print(f"⚠️ The word already exists! {terminal_color}{existing_word}{RESET} : {existing_definition}")
-        return
-
-    # Add the word to the relevant article sheet if it's not a verb
-    if not is_verb:
-        general_ws = wb["General"]
-        add_word_to_sheet(general_ws, full_word, definition)
-
-        article_sheet_name = real_article if real_article else "No Article"
-        article_ws = wb[article_sheet_name]
-        add_word_to_sheet(article_ws, full_word, definition)
-
-    # Add the word to the relevant lesson sheet
-    lesson_ws = create_lesson_sheet(wb, lesson)
-    add_word_to_sheet(lesson_ws, full_word, definition)
+        return False
 
-    # If the word is a verb, add it to the verbs sheet with conjugations
-    if is_verb:
-        verbs_ws = create_verbs_sheet(wb)
-        conjugations = get_verb_conjugations(word)
-        if conjugations:
-            add_verb_to_sheet(verbs_ws, word, definition, conjugations)
+    conjugations = get_verb_conjugations(word) if is_verb else None
+    vocab["db"].execute("INSERT INTO words VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (full_word, definition, real_article or "", lesson, int(is_verb),
+                         *((conjugations or {}).get(person) for person in PERSONS)))
+    vocab["db"].commit()
+    place_word(vocab, full_word, definition, real_article, lesson, is_verb, conjugations)
 
-    wb.save(EXCEL_FILE)
     print(f"✅ Added '{terminal_color}{full_word}{RESET}' : {definition}.")
+    return True
 
 if __name__ == "__main__":
-    wb = create_or_load_excel()
-
-    while True:
-        word = input("Enter the word (or 'q' to quit): ").strip()
-        if word == "q":
-            break
-
-        article, definition, is_verb = get_word_data(word)
-        if not definition:
-            print("Skipping word due to missing data.")
-            continue
+    vocab = create_or_load_excel()
+    unsaved = 0
 
+    try:
         while True:
-            try:
-                lesson = int(input("Which lesson did you learn this word in? ").strip())
+            word = input("Enter the word (or 'q' to quit): ").strip()
+            if word == "q":
                 break
-            except ValueError:
-                print("Invalid input: Please enter a number for the lesson.")
-        
-        add_word_to_excel(word, article, definition, lesson, wb)
+
+            article, definition, is_verb = get_word_data(word)
+            if not definition:
+                print("Skipping word due to missing data.")
+                continue
+
+            while True:
+                try:
+                    lesson = int(input("Which lesson did you learn this word in? ").strip())
+                    break
+                except ValueError:
+                    print("Invalid input: Please enter a number for the lesson.")
+
+            if add_word_to_excel(word, article, definition, lesson, is_verb, vocab):
+                unsaved += 1
+                if unsaved >= SAVE_EVERY:
+                    save_excel(vocab)
+                    unsaved = 0
+    finally:
+        # Save once on exit, including Ctrl-C and errors
+        if unsaved:
+            save_excel(vocab)
+        vocab["db"].close()